@@ -3,6 +3,8 @@ Main entry point for Statistical Arbitrage Momentum Strategy
 """
 
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import logging
 import os
@@ -14,6 +16,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Faster PNG encoding (zlib level 3, no optimize pass) and path chunking for long lines
+PNG_SAVE_KWARGS = {'compress_level': 3, 'optimize': False}
+MAX_PLOT_POINTS = 5000
+plt.rcParams['agg.path.chunksize'] = 10000
+
 
 def plot_results(results: dict) -> None:
     """
@@ -34,6 +41,7 @@ def plot_results(results: dict) -> None:
     
     for strategy_name, strategy_data in results.items():
         cumulative_returns = strategy_data['metrics']['cumulative_returns']
+        cumulative_returns = cumulative_returns.iloc[::max(1, -(-len(cumulative_returns) // MAX_PLOT_POINTS))]
         plt.plot(cumulative_returns.index, cumulative_returns.values, label=strategy_name, linewidth=2)
     
     plt.title("Strategy Cumulative Returns Comparison", fontsize=14, fontweight='bold')
@@ -42,7 +50,7 @@ def plot_results(results: dict) -> None:
     plt.legend(fontsize=11)
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig("./plots/cumulative_returns.png", dpi=300, bbox_inches='tight')
+    plt.savefig("./plots/cumulative_returns.png", dpi=300, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
     logger.info("Saved plot: ./plots/cumulative_returns.png")
     plt.close()
     
@@ -62,41 +70,40 @@ def plot_results(results: dict) -> None:
     plt.axhline(y=0, color='black', linestyle='--', linewidth=1)
     plt.xticks(rotation=45)
     plt.tight_layout()
-    plt.savefig("./plots/sharpe_ratios.png", dpi=300, bbox_inches='tight')
+    plt.savefig("./plots/sharpe_ratios.png", dpi=300, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
     logger.info("Saved plot: ./plots/sharpe_ratios.png")
     plt.close()
 
 
 def save_results(results: dict) -> None:
     """
-    Save results to CSV files.
+    Save metrics summary to CSV and strategy returns to Parquet.
     
     Args:
         results: Dictionary with strategy results
     """
     os.makedirs("./results", exist_ok=True)
     
-    # Save metrics summary
-    metrics_list = []
-    for strategy_name, strategy_data in results.items():
-        metrics = strategy_data['metrics'].copy()
-        metrics['strategy'] = strategy_name
-        
-        # Convert Series to scalar
-        if 'cumulative_returns' in metrics:
-            metrics.pop('cumulative_returns')
-            
-        metrics_list.append(metrics)
+    # Save metrics summary (cumulative_returns is a Series, not a scalar metric)
+    rows = [
+        {
+            **{key: value for key, value in strategy_data['metrics'].items() if key != 'cumulative_returns'},
+            'strategy': strategy_name
+        }
+        for strategy_name, strategy_data in results.items()
+    ]
     
-    metrics_df = pd.DataFrame(metrics_list)
+    metrics_df = pd.DataFrame.from_records(rows)
     metrics_df.to_csv("./results/performance_metrics.csv", index=False)
     logger.info("Saved metrics: ./results/performance_metrics.csv")
     
-    # Save returns for each strategy
-    for strategy_name, strategy_data in results.items():
-        returns = strategy_data['returns']
-        returns.to_csv(f"./results/{strategy_name}_returns.csv")
-        logger.info(f"Saved returns: ./results/{strategy_name}_returns.csv")
+    # Save returns for all strategies as one wide, columnar file
+    returns_df = pd.concat(
+        {name: data['returns'] for name, data in results.items()},
+        axis=1
+    )
+    returns_df.to_parquet("./results/strategy_returns.parquet", compression='snappy')
+    logger.info("Saved returns: ./results/strategy_returns.parquet")
 
 
 def main():
@@ -44,35 +44,40 @@ class DataCleaner:
         returns_numeric = returns_df.apply(pd.to_numeric, errors='coerce')
         volumes_numeric = volumes_df.apply(pd.to_numeric, errors='coerce')
         
-        # Step 2: Find first valid date for each asset
-        first_valid_dates = {}
-        for col in returns_numeric.columns:
-            first_valid = returns_numeric[col].first_valid_index()
-            first_valid_dates[col] = first_valid
+        # Step 2: Find first valid date for each asset (one vectorized pass)
+        valid = ~np.isnan(returns_numeric.to_numpy(dtype=np.float64))
+        has_data = valid.any(axis=0)
+        first_row = np.where(has_data, valid.argmax(axis=0), len(valid))
+        
+        first_valid_dates = {
+            col: (returns_numeric.index[row] if ok else None)
+            for col, row, ok in zip(returns_numeric.columns, first_row, has_data)
+        }
             
         logger.info(f"First valid dates: {first_valid_dates}")
         
         # Step 3: Sort and find suitable start date
-        sorted_dates = sorted(first_valid_dates.items(), key=lambda x: x[1])
+        n_available = int(has_data.sum())
         
-        if len(sorted_dates) < min_assets:
-            raise ValueError(f"Insufficient assets. Found {len(sorted_dates)}, need {min_assets}")
+        if n_available < min_assets:
+            raise ValueError(f"Insufficient assets. Found {n_available}, need {min_assets}")
             
-        start_date = sorted_dates[min_assets - 1][1]
+        # Row where the min_assets-th earliest asset starts (linear-time selection)
+        kth = np.argpartition(first_row, min_assets - 1)[min_assets - 1]
+        start_date = returns_numeric.index[first_row[kth]]
         logger.info(f"Selected start date: {start_date}")
         
-        # Step 4: Trim data to start date
-        clean_returns = returns_numeric.loc[start_date:].copy()
-        clean_volumes = volumes_numeric.loc[start_date:].copy()
+        # Step 4: Trim data to start date (the fills below return new frames)
+        clean_returns = returns_numeric.loc[start_date:]
+        clean_volumes = volumes_numeric.loc[start_date:]
         
-        # Step 5: Handle missing values
+        # Step 5: Handle missing values, then backward fill remaining
         if fillna_method == 'ffill':
-            clean_returns = clean_returns.fillna(method='ffill', limit=5)
-            clean_volumes = clean_volumes.fillna(method='ffill', limit=5)
-        
-        # Backward fill remaining
-        clean_returns = clean_returns.bfill()
-        clean_volumes = clean_volumes.bfill()
+            clean_returns = clean_returns.ffill(limit=5).bfill()
+            clean_volumes = clean_volumes.ffill(limit=5).bfill()
+        else:
+            clean_returns = clean_returns.bfill()
+            clean_volumes = clean_volumes.bfill()
         
         # Step 6: Handle timezone
         if clean_returns.index.tz is None:
@@ -118,10 +123,10 @@ class DataCleaner:
         valid_volumes = volumes_df.columns[zero_volumes / total_periods <= (1 - threshold)]
         
         # Get base asset names
-        base_assets = [col.replace('_Vol', '') for col in valid_volumes]
+        base_assets = {col.replace('_Vol', '') for col in valid_volumes}
         
-        # Filter returns by valid assets
-        valid_returns = [col for col in returns_df.columns if any(asset in col for asset in base_assets)]
+        # Filter returns by valid assets (e.g. 'BTCUSDT_Close' or plain 'BTCUSDT')
+        valid_returns = [col for col in returns_df.columns if col.rsplit('_', 1)[0] in base_assets]
         
         filtered_returns = returns_df[valid_returns].copy()
         filtered_volumes = volumes_df[valid_volumes].copy()
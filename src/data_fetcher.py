@@ -5,10 +5,13 @@ Handles fetching cryptocurrency data from Binance API with robust error handling
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import time
 import requests
 import logging
-from typing import Dict, Tuple, Optional
+from typing import Dict, Iterator, Tuple, Optional
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,10 +21,30 @@ class DataFetcher:
     """Fetches cryptocurrency OHLCV data from Binance API."""
     
     BASE_URL = "https://api.binance.com/api/v3/klines"
+    # Binance allows 6000 request weight per minute per IP; back off before hitting it
+    MAX_USED_WEIGHT = 5000
+    # Kline interval unit lengths in milliseconds (months rounded up to 31 days)
+    INTERVAL_UNIT_MS = {
+        's': 1000,
+        'm': 60 * 1000,
+        'h': 60 * 60 * 1000,
+        'd': 24 * 60 * 60 * 1000,
+        'w': 7 * 24 * 60 * 60 * 1000,
+        'M': 31 * 24 * 60 * 60 * 1000
+    }
     
-    def __init__(self, timeout: int = 30):
-        """Initialize DataFetcher with timeout parameter."""
+    def __init__(self, timeout: int = 30, max_workers: int = 16, cache_dir: Optional[str] = None):
+        """
+        Initialize DataFetcher.
+        
+        Args:
+            timeout: HTTP request timeout in seconds
+            max_workers: Maximum number of symbols fetched concurrently
+            cache_dir: Directory for the Parquet kline cache (None disables caching)
+        """
         self.timeout = timeout
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
         self.session = requests.Session()
         
     def fetch_cryptocurrency_data(
@@ -43,65 +66,135 @@ class DataFetcher:
         Returns:
             Tuple of (returns_dict, volumes_dict) with pd.Series for each symbol
         """
-        if end_date is None:
-            end_date = datetime.utcnow().strftime('%Y-%m-%d')
-            
+        fetched = {
+            symbol: (returns, volumes)
+            for symbol, returns, volumes in self.iter_cryptocurrency_data(symbols, start_date, end_date, interval)
+        }
+        
+        # Report symbols in the requested order rather than completion order
         returns_data = {}
         volumes_data = {}
         
         for symbol in symbols:
-            try:
-                logger.info(f"Fetching data for {symbol}...")
-                
-                # Convert dates to milliseconds
-                start_ts = int(pd.Timestamp(start_date).timestamp() * 1000)
-                end_ts = int(pd.Timestamp(end_date).timestamp() * 1000)
+            if symbol not in fetched:
+                continue
                 
-                # Fetch all data for the symbol
-                klines = self._fetch_klines(symbol, interval, start_ts, end_ts)
+            returns, volumes = fetched[symbol]
+            returns_data[f"{symbol}_Close"] = returns
+            volumes_data[f"{symbol}_Vol"] = volumes
                 
-                if not klines:
-                    logger.warning(f"No data received for {symbol}")
+        return returns_data, volumes_data
+    
+    def iter_cryptocurrency_data(
+        self,
+        symbols: list,
+        start_date: str,
+        end_date: Optional[str] = None,
+        interval: str = "1d"
+    ) -> Iterator[Tuple[str, pd.Series, pd.Series]]:
+        """
+        Fetch cryptocurrency data concurrently, yielding each symbol as soon as it completes.
+        
+        Lets callers process early symbols while the remaining downloads are in flight.
+        Symbols for which no data could be fetched are skipped.
+        
+        Args:
+            symbols: List of cryptocurrency pairs (e.g., ['BTCUSDT', 'ETHUSDT'])
+            start_date: Start date in 'YYYY-MM-DD' format
+            end_date: End date in 'YYYY-MM-DD' format (default: today)
+            interval: Kline interval (default: '1d' for daily)
+            
+        Yields:
+            Tuples of (symbol, returns, volumes) in completion order
+        """
+        if end_date is None:
+            end_date = datetime.now(timezone.utc).date().isoformat()
+            
+        # Convert dates to milliseconds
+        start_ts = int(pd.Timestamp(start_date).timestamp() * 1000)
+        end_ts = int(pd.Timestamp(end_date).timestamp() * 1000)
+        
+        if not symbols:
+            return
+        
+        # Fetch symbols concurrently over the shared session (network-bound)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(symbols))) as executor:
+            futures = {
+                executor.submit(self._fetch_symbol, symbol, interval, start_ts, end_ts): symbol
+                for symbol in symbols
+            }
+            
+            for future in as_completed(futures):
+                result = future.result()
+                if result is None:
                     continue
                     
-                # Process klines into dataframe
-                df = pd.DataFrame(klines, columns=[
-                    'open_time', 'open', 'high', 'low', 'close', 'volume',
-                    'close_time', 'quote_asset_volume', 'num_trades',
-                    'taker_buy_base', 'taker_buy_quote', 'ignore'
-                ])
-                
-                # Convert to numeric types
-                df['open_time'] = pd.to_datetime(df['open_time'], unit='ms', utc=True)
-                df['close'] = pd.to_numeric(df['close'], errors='coerce')
-                df['volume'] = pd.to_numeric(df['volume'], errors='coerce')
-                
-                # Set date as index and calculate returns
-                df.set_index('open_time', inplace=True)
-                
-                # Calculate daily returns
-                returns = df['close'].pct_change()
-                returns.name = f"{symbol}_Close"
-                
-                # Extract volumes
-                volumes = df['volume']
-                volumes.name = f"{symbol}_Vol"
-                
-                returns_data[f"{symbol}_Close"] = returns
-                volumes_data[f"{symbol}_Vol"] = volumes
-                
-                logger.info(f"Successfully processed {symbol}: {len(df)} records")
-                
-            except Exception as e:
-                logger.error(f"Error fetching data for {symbol}: {str(e)}")
-                continue
+                returns, volumes = result
+                yield futures[future], returns, volumes
+    
+    def _fetch_symbol(
+        self,
+        symbol: str,
+        interval: str,
+        start_ts: int,
+        end_ts: int
+    ) -> Optional[Tuple[pd.Series, pd.Series]]:
+        """
+        Fetch and process data for a single symbol.
+        
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval
+            start_ts: Start timestamp in milliseconds
+            end_ts: End timestamp in milliseconds
+            
+        Returns:
+            Tuple of (returns, volumes) Series, or None if no data could be fetched
+        """
+        try:
+            logger.info(f"Fetching data for {symbol}...")
+            
+            # Fetch open time, close and volume for the symbol
+            if self.cache_dir is not None and self._interval_ms(interval) is not None:
+                open_ts, close, volume = self._cached_fetch_klines(symbol, interval, start_ts, end_ts)
+            else:
+                open_ts, close, volume = self._fetch_klines(symbol, interval, start_ts, end_ts)
+            
+            if len(open_ts) == 0:
+                logger.warning(f"No data received for {symbol}")
+                return None
                 
-        return returns_data, volumes_data
+            open_time = pd.to_datetime(open_ts, unit='ms', utc=True)
+            open_time.name = 'open_time'
+            
+            # Calculate daily returns
+            returns = pd.Series(close, index=open_time, name=f"{symbol}_Close").pct_change()
+            
+            # Extract volumes
+            volumes = pd.Series(volume, index=open_time, name=f"{symbol}_Vol")
+            
+            logger.info(f"Successfully processed {symbol}: {len(open_ts)} records")
+            
+            return returns, volumes
+            
+        except Exception as e:
+            logger.error(f"Error fetching data for {symbol}: {str(e)}")
+            return None
     
-    def _fetch_klines(self, symbol: str, interval: str, start_ts: int, end_ts: int, limit: int = 1000):
+    def _fetch_klines(
+        self,
+        symbol: str,
+        interval: str,
+        start_ts: int,
+        end_ts: int,
+        limit: int = 1000
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Fetch klines from Binance API with pagination.
         
+        Only open time, close and volume are kept; they are written straight into
+        preallocated arrays sized from the requested range.
+        
         Args:
             symbol: Trading pair symbol
             interval: Kline interval
@@ -110,12 +203,17 @@ class DataFetcher:
             limit: Number of klines per request (max 1000)
             
         Returns:
-            List of klines data
+            Tuple of (open_time_ms, close, volume) arrays
         """
-        all_klines = []
+        capacity = self._estimate_rows(interval, start_ts, end_ts)
+        ts_buf = np.empty(capacity, dtype=np.int64)
+        close_buf = np.empty(capacity, dtype=np.float64)
+        vol_buf = np.empty(capacity, dtype=np.float64)
+        offset = 0
         current_start = start_ts
         
-        while current_start < end_ts:
+        # Inclusive, so a range starting exactly on end_ts still fetches that candle
+        while current_start <= end_ts:
             try:
                 params = {
                     'symbol': symbol,
@@ -130,14 +228,33 @@ class DataFetcher:
                     params=params,
                     timeout=self.timeout
                 )
+                
+                if response.status_code == 429:
+                    retry_after = int(response.headers.get('Retry-After', 60))
+                    logger.warning(f"Rate limited on {symbol}, retrying in {retry_after}s")
+                    time.sleep(retry_after)
+                    continue
+                    
                 response.raise_for_status()
+                self._respect_rate_limit(response)
                 
                 klines = response.json()
                 
                 if not klines:
                     break
                     
-                all_klines.extend(klines)
+                n = len(klines)
+                if offset + n > capacity:
+                    capacity = max(2 * capacity, offset + n)
+                    ts_buf = np.resize(ts_buf, capacity)
+                    close_buf = np.resize(close_buf, capacity)
+                    vol_buf = np.resize(vol_buf, capacity)
+                    
+                for i, kline in enumerate(klines, start=offset):
+                    ts_buf[i] = kline[0]
+                    close_buf[i] = float(kline[4])
+                    vol_buf[i] = float(kline[5])
+                offset += n
                 
                 # Update start time for next request
                 current_start = klines[-1][0] + 1
@@ -146,7 +263,118 @@ class DataFetcher:
                 logger.error(f"API error for {symbol}: {str(e)}")
                 break
                 
-        return all_klines
+        return ts_buf[:offset], close_buf[:offset], vol_buf[:offset]
+    
+    def _estimate_rows(self, interval: str, start_ts: int, end_ts: int) -> int:
+        """
+        Upper bound on the number of klines in a time range.
+        
+        Args:
+            interval: Kline interval (e.g. '1d', '4h', '15m')
+            start_ts: Start timestamp in milliseconds
+            end_ts: End timestamp in milliseconds
+            
+        Returns:
+            Estimated row count (at least 1)
+        """
+        interval_ms = self._interval_ms(interval)
+        if interval_ms is None:
+            return 1000
+            
+        return max(1, -(-(end_ts - start_ts) // interval_ms) + 1)
+    
+    def _interval_ms(self, interval: str) -> Optional[int]:
+        """
+        Length of a kline interval in milliseconds.
+        
+        Args:
+            interval: Kline interval (e.g. '1d', '4h', '15m')
+            
+        Returns:
+            Interval length, or None if the interval string is not recognised
+        """
+        try:
+            return int(interval[:-1]) * self.INTERVAL_UNIT_MS[interval[-1]]
+        except (KeyError, ValueError):
+            return None
+    
+    def _cached_fetch_klines(
+        self,
+        symbol: str,
+        interval: str,
+        start_ts: int,
+        end_ts: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Fetch klines through the on-disk Parquet cache.
+        
+        The cache holds closed candles for (symbol, interval, start). Only candles
+        after the last cached one are requested from the API; newly closed
+        candles are appended to the cache, the still-open candle never is.
+        
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval
+            start_ts: Start timestamp in milliseconds
+            end_ts: End timestamp in milliseconds
+            
+        Returns:
+            Tuple of (open_time_ms, close, volume) arrays
+        """
+        interval_ms = self._interval_ms(interval)
+        cache_path = os.path.join(self.cache_dir, f"{symbol}_{interval}_{start_ts}.parquet")
+        
+        if os.path.exists(cache_path):
+            cached = pd.read_parquet(cache_path)
+            open_ts = cached['open_time'].to_numpy(dtype=np.int64)
+            close = cached['close'].to_numpy(dtype=np.float64)
+            volume = cached['volume'].to_numpy(dtype=np.float64)
+        else:
+            open_ts = np.empty(0, dtype=np.int64)
+            close = np.empty(0, dtype=np.float64)
+            volume = np.empty(0, dtype=np.float64)
+            
+        n_cached = len(open_ts)
+        # Resume just after the last cached open time, like the pagination does;
+        # stepping a whole interval would skip candles of months shorter than 31 days
+        next_ts = open_ts[-1] + 1 if n_cached else start_ts
+        
+        if next_ts <= end_ts:
+            tail_ts, tail_close, tail_volume = self._fetch_klines(symbol, interval, next_ts, end_ts)
+            open_ts = np.concatenate([open_ts, tail_ts])
+            close = np.concatenate([close, tail_close])
+            volume = np.concatenate([volume, tail_volume])
+            
+            # Persist only candles that have closed
+            now_ms = int(time.time() * 1000)
+            n_closed = int(np.searchsorted(open_ts, now_ms - interval_ms, side='right'))
+            
+            if n_closed > n_cached:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = f"{cache_path}.tmp"
+                pd.DataFrame({
+                    'open_time': open_ts[:n_closed],
+                    'close': close[:n_closed],
+                    'volume': volume[:n_closed]
+                }).to_parquet(tmp_path, compression='zstd', index=False)
+                os.replace(tmp_path, cache_path)
+                
+        in_range = open_ts <= end_ts
+        return open_ts[in_range], close[in_range], volume[in_range]
+    
+    def _respect_rate_limit(self, response: requests.Response) -> None:
+        """
+        Sleep until the next minute window if the used request weight is near the limit.
+        
+        Args:
+            response: Response carrying Binance's X-MBX-USED-WEIGHT-1M header
+        """
+        used_weight = int(response.headers.get('X-MBX-USED-WEIGHT-1M', 0))
+        
+        if used_weight >= self.MAX_USED_WEIGHT:
+            wait = 60 - time.time() % 60
+            logger.warning(f"Used weight {used_weight}, backing off for {wait:.1f}s")
+            time.sleep(wait)
     
     def close(self):
         """Close the session."""
@@ -6,12 +6,153 @@ Calculates backtesting metrics and strategy performance analysis.
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Union
+
+from _njit import njit, prange, NUMBA_AVAILABLE
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _pnl_turnover_numpy(W: np.ndarray, R: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Gross PnL and turnover per day using NumPy (NaN weights/returns are skipped)."""
+    pnl = np.nansum(W[:-1] * R[1:], axis=1)
+    turnover = np.nansum(np.abs(np.diff(W, axis=0)), axis=1)
+    return pnl, turnover
+
+
+@njit(cache=True, nogil=True, fastmath={'reassoc', 'contract'})
+def _pnl_turnover_numba(W, R):
+    """
+    Fused single-pass PnL and turnover kernel (NaN-skipping like np.nansum).
+    
+    Releases the GIL so callers can backtest several windows in threads; it is
+    deliberately not ``parallel=True`` since numba's default workqueue threading
+    layer aborts on concurrent parallel launches from multiple threads.
+    """
+    n_days, n_assets = W.shape
+    pnl = np.zeros(n_days - 1)
+    turnover = np.zeros(n_days - 1)
+    for t in range(1, n_days):
+        s = 0.0
+        tv = 0.0
+        for j in range(n_assets):
+            p = W[t - 1, j] * R[t, j]
+            if not np.isnan(p):
+                s += p
+            d = abs(W[t, j] - W[t - 1, j])
+            if not np.isnan(d):
+                tv += d
+        pnl[t - 1] = s
+        turnover[t - 1] = tv
+    return pnl, turnover
+
+
+def _pnl_turnover_kernel(W: np.ndarray, R: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute daily gross PnL (yesterday's weights, today's returns) and turnover.
+    
+    Args:
+        W: (days, assets) float64 array of portfolio weights
+        R: (days, assets) float64 array of asset returns
+        
+    Returns:
+        Tuple of (pnl, turnover) arrays of length days - 1
+    """
+    if len(W) < 2:
+        return np.zeros(0), np.zeros(0)
+    if NUMBA_AVAILABLE:
+        return _pnl_turnover_numba(W, R)
+    return _pnl_turnover_numpy(W, R)
+
+
+def _drawdown_numpy(r: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Cumulative growth and maximum drawdown using NumPy accumulators."""
+    cum = np.cumprod(1.0 + np.nan_to_num(r))
+    peak = np.maximum.accumulate(cum)
+    return cum, float((cum / peak - 1.0).min())
+
+
+@njit(cache=True, nogil=True)
+def _drawdown_numba(r):
+    """Single-pass scan keeping cumulative growth, running peak and max drawdown."""
+    out = np.empty_like(r)
+    cum = 1.0
+    peak = 0.0
+    mdd = 0.0
+    for i in range(len(r)):
+        if not np.isnan(r[i]):
+            cum *= 1.0 + r[i]
+        if cum > peak:
+            peak = cum
+        dd = cum / peak - 1.0
+        if dd < mdd:
+            mdd = dd
+        out[i] = cum
+    return out, mdd
+
+
+def _drawdown(r: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Compute cumulative growth of 1 and the maximum drawdown of a return series.
+    
+    Args:
+        r: 1-D float64 array of periodic returns
+        
+    Returns:
+        Tuple of (cumulative_growth, max_drawdown)
+    """
+    if len(r) == 0:
+        return np.zeros(0), np.nan
+    if NUMBA_AVAILABLE:
+        return _drawdown_numba(r)
+    return _drawdown_numpy(r)
+
+
+@njit(cache=True, parallel=True)
+def _metrics_all(R):
+    """
+    Per-column cumulative growth, max drawdown, sample std and win count.
+    
+    One native pass per strategy column, with columns processed in parallel.
+    """
+    n_days, n_strategies = R.shape
+    cum_out = np.empty_like(R)
+    max_drawdown = np.zeros(n_strategies)
+    volatility = np.full(n_strategies, np.nan)
+    wins = np.zeros(n_strategies)
+    for k in prange(n_strategies):
+        cum = 1.0
+        peak = 0.0
+        mdd = 0.0
+        total = 0.0
+        count = 0
+        for i in range(n_days):
+            r = R[i, k]
+            if not np.isnan(r):
+                cum *= 1.0 + r
+                total += r
+                count += 1
+                if r > 0:
+                    wins[k] += 1
+            if cum > peak:
+                peak = cum
+            dd = cum / peak - 1.0
+            if dd < mdd:
+                mdd = dd
+            cum_out[i, k] = cum
+        max_drawdown[k] = mdd
+        if count > 1:
+            mean = total / count
+            ss = 0.0
+            for i in range(n_days):
+                r = R[i, k]
+                if not np.isnan(r):
+                    ss += (r - mean) * (r - mean)
+            volatility[k] = np.sqrt(ss / (count - 1))
+    return cum_out, max_drawdown, volatility, wins
+
+
 class PerformanceAnalyzer:
     """Analyzes strategy performance and calculates key metrics."""
     
@@ -36,27 +177,32 @@ class PerformanceAnalyzer:
         Returns:
             Series with daily strategy returns
         """
-        # Align data
-        weights = portfolio_weights.loc[daily_returns.index]
-        returns = daily_returns.loc[weights.index]
+        # Align data with a single inner join (only when the caller has not already done so)
+        if not portfolio_weights.index.equals(daily_returns.index):
+            portfolio_weights, daily_returns = portfolio_weights.align(daily_returns, join='inner', axis=0)
+        if not portfolio_weights.columns.equals(daily_returns.columns):
+            daily_returns = daily_returns[portfolio_weights.columns]
+        assert portfolio_weights.index.is_monotonic_increasing, "Returns index must be sorted by date"
+        
+        W = portfolio_weights.to_numpy(dtype=np.float64, copy=False)
+        R = daily_returns.to_numpy(dtype=np.float64, copy=False)
         
-        # Calculate strategy returns (today's weights, tomorrow's returns)
-        strategy_returns = weights.shift(1).mul(returns).sum(axis=1)
+        # Calculate strategy returns (today's weights, tomorrow's returns) and
+        # turnover as absolute change in weights, in a single pass
+        strategy_returns, turnover = _pnl_turnover_kernel(W, R)
         
         # Account for transaction costs
-        # Calculate turnover as absolute change in weights
-        turnover = weights.diff().abs().sum(axis=1)
         transaction_costs = turnover * transaction_cost_pct
         
         # Subtract transaction costs
         strategy_returns = strategy_returns - transaction_costs
         
-        return strategy_returns.dropna()
+        return pd.Series(strategy_returns, index=portfolio_weights.index[1:])
     
     def calculate_performance_metrics(
         self,
         strategy_returns: pd.Series,
-        benchmark_returns: pd.Series = None,
+        benchmark_returns: Union[pd.Series, np.ndarray] = None,
         periods_per_year: int = 252
     ) -> Dict:
         """
@@ -64,7 +210,49 @@ class PerformanceAnalyzer:
         
         Args:
             strategy_returns: Series with daily strategy returns
-            benchmark_returns: Series with daily benchmark returns (optional)
+            benchmark_returns: Series with daily benchmark returns, or an array already
+                aligned with strategy_returns (optional)
+            periods_per_year: Number of trading periods per year (default 252)
+            
+        Returns:
+            Dictionary with performance metrics
+        """
+        # Cumulative growth and maximum drawdown in a single scan
+        cumulative, max_drawdown = _drawdown(
+            strategy_returns.to_numpy(dtype=np.float64, copy=False)
+        )
+        
+        daily_volatility = strategy_returns.std()
+        
+        # Win rate
+        win_rate = (strategy_returns > 0).sum() / len(strategy_returns)
+        
+        return self._assemble_metrics(
+            strategy_returns, cumulative, max_drawdown, daily_volatility,
+            win_rate, benchmark_returns, periods_per_year
+        )
+    
+    def _assemble_metrics(
+        self,
+        strategy_returns: pd.Series,
+        cumulative: np.ndarray,
+        max_drawdown: float,
+        daily_volatility: float,
+        win_rate: float,
+        benchmark_returns: Union[pd.Series, np.ndarray] = None,
+        periods_per_year: int = 252
+    ) -> Dict:
+        """
+        Build the metrics dictionary from precomputed per-strategy statistics.
+        
+        Args:
+            strategy_returns: Series with daily strategy returns
+            cumulative: Cumulative growth of 1 for each day
+            max_drawdown: Maximum drawdown (negative fraction)
+            daily_volatility: Sample standard deviation of daily returns
+            win_rate: Fraction of days with a positive return
+            benchmark_returns: Series with daily benchmark returns, or an array already
+                aligned with strategy_returns (optional)
             periods_per_year: Number of trading periods per year (default 252)
             
         Returns:
@@ -73,24 +261,16 @@ class PerformanceAnalyzer:
         if len(strategy_returns) < periods_per_year:
             logger.warning("Insufficient data for annualized metrics")
             
+        cumulative_returns = pd.Series(cumulative, index=strategy_returns.index)
+        
         # Basic metrics
-        total_return = (1 + strategy_returns).prod() - 1
+        total_return = cumulative[-1] - 1 if len(cumulative) else np.nan
         annualized_return = (1 + total_return) ** (periods_per_year / len(strategy_returns)) - 1
         
-        daily_volatility = strategy_returns.std()
         annualized_volatility = daily_volatility * np.sqrt(periods_per_year)
         
         sharpe_ratio = annualized_return / annualized_volatility if annualized_volatility > 0 else 0
         
-        # Maximum drawdown
-        cumulative_returns = (1 + strategy_returns).cumprod()
-        running_max = cumulative_returns.expanding().max()
-        drawdown = (cumulative_returns - running_max) / running_max
-        max_drawdown = drawdown.min()
-        
-        # Win rate
-        win_rate = (strategy_returns > 0).sum() / len(strategy_returns)
-        
         metrics = {
             'total_return': total_return,
             'annualized_return': annualized_return,
@@ -103,22 +283,35 @@ class PerformanceAnalyzer:
         
         # Benchmark comparison
         if benchmark_returns is not None:
-            benchmark_returns = benchmark_returns.loc[strategy_returns.index]
-            
-            # Calculate alpha and beta
-            covariance = np.cov(strategy_returns.values, benchmark_returns.values)[0, 1]
-            benchmark_variance = benchmark_returns.var()
+            if isinstance(benchmark_returns, pd.Series):
+                benchmark_returns = benchmark_returns.loc[strategy_returns.index]
+            b = np.asarray(benchmark_returns, dtype=np.float64)
+            s = strategy_returns.to_numpy(dtype=np.float64)
+            if len(b) != len(s):
+                raise ValueError(
+                    f"Benchmark returns ({len(b)}) must be aligned with strategy returns ({len(s)})"
+                )
             
-            beta = covariance / benchmark_variance if benchmark_variance > 0 else 0
-            alpha = annualized_return - (risk_free_rate := 0) - beta * (benchmark_returns.mean() * periods_per_year - risk_free_rate)
+            # Use the days on which both series have a return
+            valid = ~(np.isnan(s) | np.isnan(b))
+            s, b = s[valid], b[valid]
+            benchmark_mean = b.mean() if len(b) else np.nan
             
-            # Correlation
-            correlation = strategy_returns.corr(benchmark_returns)
+            # Calculate alpha and beta
+            with np.errstate(invalid='ignore', divide='ignore'):
+                covariance = np.cov(s, b)[0, 1] if len(b) > 1 else np.nan
+                benchmark_variance = b.var(ddof=1) if len(b) > 1 else np.nan
+                
+                beta = covariance / benchmark_variance if benchmark_variance > 0 else 0
+                alpha = annualized_return - (risk_free_rate := 0) - beta * (benchmark_mean * periods_per_year - risk_free_rate)
+                
+                # Correlation
+                correlation = np.corrcoef(s, b)[0, 1] if len(b) > 1 else np.nan
             
             metrics['beta'] = beta
             metrics['alpha'] = alpha
             metrics['correlation'] = correlation
-            metrics['benchmark_return'] = benchmark_returns.mean() * periods_per_year
+            metrics['benchmark_return'] = benchmark_mean * periods_per_year
             
         return metrics
     
@@ -164,9 +357,22 @@ class PerformanceAnalyzer:
             DataFrame with metrics for each strategy
         """
         comparison = {}
+        series = list(strategies_dict.values())
+        shared_index = len(series) > 1 and all(s.index.equals(series[0].index) for s in series[1:])
         
-        for name, returns in strategies_dict.items():
-            metrics = self.calculate_performance_metrics(returns, benchmark)
-            comparison[name] = metrics
+        if NUMBA_AVAILABLE and shared_index and len(series[0]) > 0:
+            # Stack strategies and compute the per-strategy scans in one native call
+            R = np.column_stack([s.to_numpy(dtype=np.float64) for s in series])
+            cumulative, max_drawdown, volatility, wins = _metrics_all(R)
+            
+            for k, (name, returns) in enumerate(strategies_dict.items()):
+                comparison[name] = self._assemble_metrics(
+                    returns, cumulative[:, k], max_drawdown[k], volatility[k],
+                    wins[k] / len(returns), benchmark
+                )
+        else:
+            for name, returns in strategies_dict.items():
+                metrics = self.calculate_performance_metrics(returns, benchmark)
+                comparison[name] = metrics
             
         return pd.DataFrame(comparison).T
@@ -6,19 +6,189 @@ Generates momentum and reversal trading signals for statistical arbitrage.
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _cumulative_sums(R: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Zero-padded cumulative sums and valid-value counts down the rows of a 2-D array.
+    
+    Any rolling sum is then ``csum[t + w] - csum[t]``, so every window shares one pass.
+    
+    Args:
+        R: 2-D float array of returns (days x assets)
+        
+    Returns:
+        Tuple of (csum, ccount) arrays with one extra leading row of zeros
+    """
+    valid = ~np.isnan(R)
+    zero = np.zeros((1, R.shape[1]))
+    # Accumulate in float64 even for float32 input so long histories do not drift
+    csum = np.concatenate([zero, np.cumsum(np.where(valid, R, 0.0), axis=0, dtype=np.float64)])
+    ccount = np.concatenate([zero, np.cumsum(valid, axis=0)])
+    return csum, ccount
+
+
+def _rolling_mean(R: np.ndarray, window: int, cumsums: Tuple[np.ndarray, np.ndarray] = None) -> np.ndarray:
+    """
+    Rolling mean down the rows of a 2-D array, NaN until a full window is available.
+    
+    Matches ``pd.DataFrame(R).rolling(window).mean()``: windows containing a NaN are NaN.
+    
+    Args:
+        R: 2-D float array of returns (days x assets)
+        window: Rolling window size in rows
+        cumsums: Precomputed ``_cumulative_sums(R)`` to reuse across windows
+        
+    Returns:
+        Array of the same shape with rolling means
+    """
+    if window == 1:
+        # Exact values, so ties between assets survive into the ranking
+        return R.copy()
+        
+    csum, ccount = cumsums if cumsums is not None else _cumulative_sums(R)
+    
+    out = np.full(R.shape, np.nan, dtype=R.dtype)
+    if window <= len(R):
+        full = (ccount[window:] - ccount[:-window]) == window
+        out[window - 1:] = np.where(full, (csum[window:] - csum[:-window]) / window, np.nan)
+    return out
+
+
+def _rank_rows(X: np.ndarray) -> np.ndarray:
+    """
+    Rank each row of a 2-D array (average ranks for ties, NaN stays NaN).
+    
+    Equivalent to ``pd.DataFrame(X).rank(axis=1)`` but without pandas overhead.
+    
+    Args:
+        X: 2-D float array
+        
+    Returns:
+        Array of the same shape with 1-based ranks
+    """
+    n_rows, n_cols = X.shape
+    order = np.argsort(X, axis=1, kind='stable')  # NaNs sort last
+    sorted_x = np.take_along_axis(X, order, axis=1)
+    
+    # Tie groups: for every sorted position find the first and last slot of its group
+    positions = np.broadcast_to(np.arange(n_cols), (n_rows, n_cols))
+    new_group = np.ones((n_rows, n_cols), dtype=bool)
+    new_group[:, 1:] = sorted_x[:, 1:] != sorted_x[:, :-1]
+    last_in_group = np.ones((n_rows, n_cols), dtype=bool)
+    last_in_group[:, :-1] = new_group[:, 1:]
+    group_start = np.maximum.accumulate(np.where(new_group, positions, 0), axis=1)
+    group_end = np.minimum.accumulate(
+        np.where(last_in_group, positions, n_cols - 1)[:, ::-1], axis=1
+    )[:, ::-1]
+    
+    sorted_ranks = ((group_start + group_end) / 2.0 + 1.0).astype(X.dtype, copy=False)
+    sorted_ranks[np.isnan(sorted_x)] = np.nan
+    
+    ranks = np.empty_like(sorted_ranks)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=1)
+    return ranks
+
+
+def _demean_normalize(ranked: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cross-sectionally demean ranks and scale them to unit gross exposure.
+    
+    Args:
+        ranked: 2-D array of ranks (NaN for missing assets)
+        
+    Returns:
+        Tuple of (demeaned, portfolio_weights) arrays
+    """
+    valid = ~np.isnan(ranked)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        row_mean = np.where(valid, ranked, 0.0).sum(axis=1, keepdims=True) / valid.sum(axis=1, keepdims=True, dtype=ranked.dtype)
+        demeaned = ranked - row_mean
+        gross = np.nansum(np.abs(demeaned), axis=1, keepdims=True)
+        portfolio_weights = demeaned / gross
+    return demeaned, portfolio_weights
+
+
 class SignalGenerator:
-    """Generates momentum and reversal signals across multiple timeframes."""
+    """
+    Generates momentum and reversal signals across multiple timeframes.
+    
+    Signal intermediates (rolling means, ranks, demeaned ranks, weights) are kept
+    in float32 to halve memory traffic. Rolling sums are still accumulated in
+    float64, and ranks are exact half-integers, so the only precision loss is
+    rounding each rolling mean to ~7 significant digits; assets whose means agree
+    to that precision rank as ties. Weights are upcast to float64 in the PnL.
+    
+    Every call computes its signals from the current contents of the returns
+    frame into newly allocated arrays, so signals returned by different calls
+    never share memory.
+    """
+    
+    # Below this many returns values, thread start-up outweighs running windows in parallel
+    PARALLEL_MIN_ELEMENTS = 100_000
     
     def __init__(self):
         """Initialize SignalGenerator."""
         self.signals = {}
         
+    def _ranked_demeaned_weights(
+        self,
+        R: np.ndarray,
+        window: int,
+        cumsums: Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        Rolling mean, rank, demean and normalize pipeline in the momentum direction.
+        
+        Reversal signals are derived from the same arrays: since
+        ``rank(-x) = n_valid + 1 - rank(x)`` with average ties, the reversal
+        demeaned ranks and portfolio weights are exactly the negated momentum ones.
+        
+        Args:
+            R: 2-D float array of daily returns (days x assets)
+            window: Rolling window size in days
+            cumsums: ``_cumulative_sums(R)``, shared by all windows of one call
+            
+        Returns:
+            Tuple of (rolling_returns, ranked, demeaned, portfolio_weights) arrays
+        """
+        rolling_returns = _rolling_mean(R, window, cumsums)
+        ranked = _rank_rows(rolling_returns)
+        demeaned, portfolio_weights = _demean_normalize(ranked)
+        return rolling_returns, ranked, demeaned, portfolio_weights
+    
+    def _window_pipelines(self, returns: pd.DataFrame, windows: list) -> list:
+        """
+        Run ``_ranked_demeaned_weights`` for every window on one shared returns array.
+        
+        The float32 conversion and cumulative sums are computed once; windows then
+        run in parallel threads for large frames, since NumPy releases the GIL for
+        the heavy passes.
+        
+        Args:
+            returns: DataFrame with daily returns
+            windows: List of rolling window sizes in days
+            
+        Returns:
+            List of (rolling_returns, ranked, demeaned, portfolio_weights) tuples, in window order
+        """
+        R = returns.to_numpy(dtype=np.float32)
+        cumsums = _cumulative_sums(R)
+        
+        if len(windows) < 2 or R.size < self.PARALLEL_MIN_ELEMENTS:
+            return [self._ranked_demeaned_weights(R, window, cumsums) for window in windows]
+            
+        with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+            return list(executor.map(
+                lambda window: self._ranked_demeaned_weights(R, window, cumsums),
+                windows
+            ))
+        
     def generate_momentum_signals(
         self,
         returns: pd.DataFrame,
@@ -38,24 +208,19 @@ class SignalGenerator:
         
         momentum_signals = {}
         
-        for window in windows:
-            # Calculate rolling returns (momentum)
-            rolling_returns = returns.rolling(window=window).mean()
-            
-            # Rank across assets (higher return = higher rank)
-            ranked = rolling_returns.rank(axis=1)
-            
-            # Demean the ranked returns
-            demeaned = ranked.subtract(ranked.mean(axis=1), axis=0)
-            
-            # Normalize to get portfolio weights
-            portfolio_weights = demeaned.div(demeaned.abs().sum(axis=1), axis=0)
+        index, columns = returns.index, returns.columns
+        
+        # Rolling returns ranked across assets (higher return = higher rank),
+        # demeaned and normalized to portfolio weights
+        pipelines = self._window_pipelines(returns, windows)
+        
+        for window, (rolling_returns, ranked, demeaned, portfolio_weights) in zip(windows, pipelines):
             
             momentum_signals[f"{window}d"] = {
-                'returns': rolling_returns,
-                'ranked': ranked,
-                'demeaned': demeaned,
-                'portfolio_weights': portfolio_weights
+                'returns': pd.DataFrame(rolling_returns, index=index, columns=columns, copy=False),
+                'ranked': pd.DataFrame(ranked, index=index, columns=columns, copy=False),
+                'demeaned': pd.DataFrame(demeaned, index=index, columns=columns, copy=False),
+                'portfolio_weights': pd.DataFrame(portfolio_weights, index=index, columns=columns, copy=False)
             }
             
             logger.info(f"Generated momentum signals for {window}d window")
@@ -81,28 +246,28 @@ class SignalGenerator:
         
         reversal_signals = {}
         
-        for window in windows:
-            # Calculate rolling returns
-            rolling_returns = returns.rolling(window=window).mean()
+        index, columns = returns.index, returns.columns
+        pipelines = self._window_pipelines(returns, windows)
+        
+        for window, (rolling_returns, mom_ranked, mom_demeaned, mom_weights) in zip(windows, pipelines):
             
             # Negate for reversal (exploit mean reversion)
             negated = -rolling_returns
             
-            # Rank across assets
-            ranked = negated.rank(axis=1)
-            
-            # Demean the ranked returns
-            demeaned = ranked.subtract(ranked.mean(axis=1), axis=0)
+            # Rank across assets: rank(-x) = n_valid + 1 - rank(x)
+            n_valid = (~np.isnan(mom_ranked)).sum(axis=1, keepdims=True, dtype=mom_ranked.dtype)
+            ranked = n_valid + 1 - mom_ranked
             
-            # Normalize to get portfolio weights
-            portfolio_weights = demeaned.div(demeaned.abs().sum(axis=1), axis=0)
+            # Demeaned ranks and portfolio weights flip sign
+            demeaned = -mom_demeaned
+            portfolio_weights = -mom_weights
             
             reversal_signals[f"{window}d"] = {
-                'returns': rolling_returns,
-                'negated': negated,
-                'ranked': ranked,
-                'demeaned': demeaned,
-                'portfolio_weights': portfolio_weights
+                'returns': pd.DataFrame(rolling_returns, index=index, columns=columns, copy=False),
+                'negated': pd.DataFrame(negated, index=index, columns=columns, copy=False),
+                'ranked': pd.DataFrame(ranked, index=index, columns=columns, copy=False),
+                'demeaned': pd.DataFrame(demeaned, index=index, columns=columns, copy=False),
+                'portfolio_weights': pd.DataFrame(portfolio_weights, index=index, columns=columns, copy=False)
             }
             
             logger.info(f"Generated reversal signals for {window}d window")
@@ -122,13 +287,22 @@ class SignalGenerator:
         stats = {}
         
         for window, signal_data in signals.items():
-            weights = signal_data['portfolio_weights'].dropna()
+            W = signal_data['portfolio_weights'].dropna().to_numpy(dtype=np.float64)
+            
+            long_mask = W > 0
+            short_mask = W < 0
             
+            with np.errstate(invalid='ignore', divide='ignore'):
+                # Per-asset mean of long/short weights, then averaged across assets
+                long_means = np.where(long_mask, W, 0.0).sum(axis=0) / long_mask.sum(axis=0)
+                short_means = np.where(short_mask, W, 0.0).sum(axis=0) / short_mask.sum(axis=0)
+                
             stats[window] = {
-                'mean_long_weight': weights[weights > 0].mean().mean(),
-                'mean_short_weight': weights[weights < 0].mean().mean(),
-                'max_concentration': weights.abs().max().max(),
-                'avg_turnover': weights.diff().abs().sum().mean()
+                'mean_long_weight': np.nanmean(long_means) if long_mask.any() else np.nan,
+                'mean_short_weight': np.nanmean(short_means) if short_mask.any() else np.nan,
+                'max_concentration': np.abs(W).max() if W.size else np.nan,
+                # Total turnover per asset, averaged across assets
+                'avg_turnover': np.abs(np.diff(W, axis=0)).sum(axis=0).mean() if W.shape[1] else np.nan
             }
             
         return pd.DataFrame(stats).T
@@ -0,0 +1,60 @@
+"""
+Statistics Module
+Fused summary statistics over portfolio weight matrices.
+"""
+
+import numpy as np
+from typing import Tuple
+
+from _njit import njit, NUMBA_AVAILABLE
+
+
+def _weight_stats_numpy(w: np.ndarray) -> Tuple[float, float]:
+    """Concentration and turnover using separate NumPy reductions."""
+    concentration = np.nanmean(np.fmax.reduce(np.abs(w), axis=0))
+    turnover = np.nansum(np.abs(np.diff(w, axis=0))) / len(w)
+    return float(concentration), float(turnover)
+
+
+@njit(cache=True, nogil=True, fastmath={'reassoc', 'contract'})
+def _weight_stats_numba(w):
+    """Single pass over the weights keeping per-asset peak exposure and turnover."""
+    n_days, n_assets = w.shape
+    peak = np.full(n_assets, np.nan)
+    turnover = 0.0
+    for t in range(n_days):
+        for j in range(n_assets):
+            a = abs(w[t, j])
+            if not np.isnan(a) and (np.isnan(peak[j]) or a > peak[j]):
+                peak[j] = a
+            if t > 0:
+                d = abs(w[t, j] - w[t - 1, j])
+                if not np.isnan(d):
+                    turnover += d
+    total = 0.0
+    count = 0
+    for j in range(n_assets):
+        if not np.isnan(peak[j]):
+            total += peak[j]
+            count += 1
+    concentration = total / count if count > 0 else np.nan
+    return concentration, turnover / n_days
+
+
+def weight_stats(w: np.ndarray) -> Tuple[float, float]:
+    """
+    Concentration and turnover of a portfolio weight matrix (NaN weights are skipped).
+
+    Args:
+        w: (days, assets) float array of portfolio weights
+
+    Returns:
+        Tuple of (concentration, turnover): the largest absolute weight per asset
+        averaged across assets, and the total absolute weight change averaged
+        over all days (the first day has none)
+    """
+    if len(w) == 0 or w.shape[1] == 0:
+        return np.nan, np.nan
+    if NUMBA_AVAILABLE:
+        return _weight_stats_numba(w)
+    return _weight_stats_numpy(w)
@@ -6,13 +6,18 @@ Orchestrates the statistical arbitrage momentum strategy workflow.
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Tuple
-from datetime import datetime
+import json
+import os
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timezone
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor
 
 from data_fetcher import DataFetcher
 from data_cleaner import DataCleaner
 from signal_generator import SignalGenerator
 from performance_analyzer import PerformanceAnalyzer
+from stats import weight_stats
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,12 +26,63 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _write_arrow(frame: pd.DataFrame, path: str) -> None:
+    """
+    Write a DataFrame to an Arrow IPC file, with its index as the first column.
+    
+    NaNs are stored as float NaN rather than Arrow nulls so that the file can be
+    memory-mapped back without a copy.
+    
+    Args:
+        frame: DataFrame to write
+        path: Destination file path
+    """
+    # Imported here so pyarrow is only needed when stage persistence is used
+    import pyarrow as pa
+    
+    arrays = [pa.array(frame.index)] + [
+        pa.array(frame[column].to_numpy(), from_pandas=False) for column in frame.columns
+    ]
+    names = [frame.index.name or "index"] + [str(column) for column in frame.columns]
+    table = pa.table(arrays, names=names)
+    
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _read_arrow(path: str) -> pd.DataFrame:
+    """
+    Memory-map a DataFrame written by ``_write_arrow``.
+    
+    Columns are zero-copy (read-only) views of the mapped file.
+    
+    Args:
+        path: Arrow IPC file path
+        
+    Returns:
+        DataFrame indexed by the file's first column
+    """
+    import pyarrow as pa
+    
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    frame = table.to_pandas(split_blocks=True, zero_copy_only=True)
+    return frame.set_index(frame.columns[0])
+
+
 class StatArbitrageStrategy:
     """
     Statistical Arbitrage Momentum Strategy
     Implements momentum-based long-short trading across cryptocurrency universe.
     """
     
+    # Pipeline stages whose outputs can be persisted to stage_dir and resumed from
+    PIPELINE_STAGES = ("fetch", "prepare", "signals")
+    SIGNAL_FIELDS = ("returns", "ranked", "demeaned", "portfolio_weights")
+    STAGE_MANIFEST = "manifest.json"
+    
     def __init__(
         self,
         start_date: str = "2018-01-01",
@@ -34,7 +90,11 @@ class StatArbitrageStrategy:
         symbols: list = None,
         liquidity_threshold: float = 0.40,
         transaction_cost_pct: float = 0.0005,
-        momentum_windows: list = [60, 120, 252]
+        momentum_windows: list = [60, 120, 252],
+        benchmark_symbol: str = "BTCUSDT",
+        cache_dir: str = "./data/cache",
+        stage_dir: str = None,
+        debug: bool = False
     ):
         """
         Initialize the strategy.
@@ -46,12 +106,22 @@ class StatArbitrageStrategy:
             liquidity_threshold: Liquidity threshold for asset filtering
             transaction_cost_pct: Transaction costs as percentage
             momentum_windows: Momentum windows to analyze (in days)
+            benchmark_symbol: Symbol used as the performance benchmark
+            cache_dir: Directory for cached Binance klines (None disables caching)
+            stage_dir: Directory for Arrow IPC stage outputs used to resume
+                run_full_pipeline() (None disables); outputs saved with other
+                settings are ignored
+            debug: Run extra diagnostics such as the data quality report
         """
         self.start_date = start_date
-        self.end_date = end_date or datetime.utcnow().strftime('%Y-%m-%d')
+        self.end_date = end_date or datetime.now(timezone.utc).date().isoformat()
         self.liquidity_threshold = liquidity_threshold
         self.transaction_cost_pct = transaction_cost_pct
         self.momentum_windows = momentum_windows
+        self.benchmark_symbol = benchmark_symbol
+        self.cache_dir = cache_dir
+        self.stage_dir = stage_dir
+        self.debug = debug
         
         # Default symbols if not provided
         if symbols is None:
@@ -63,18 +133,34 @@ class StatArbitrageStrategy:
         else:
             self.symbols = symbols
             
-        # Initialize components
-        self.fetcher = DataFetcher()
-        self.cleaner = DataCleaner(liquidity_threshold=liquidity_threshold)
-        self.signal_generator = SignalGenerator()
-        self.analyzer = PerformanceAnalyzer()
-        
         # Data storage
         self.returns = None
         self.volumes = None
         self.benchmark_returns = None
         
-        logger.info(f"Initialized strategy with {len(self.symbols)} symbols")
+        logger.info("Initialized strategy with %d symbols", len(self.symbols))
+        
+    # Components are created on first use, so e.g. a strategy that is only
+    # handed cached data never opens an HTTP session
+    @cached_property
+    def fetcher(self) -> DataFetcher:
+        """Binance data fetcher."""
+        return DataFetcher(cache_dir=self.cache_dir)
+    
+    @cached_property
+    def cleaner(self) -> DataCleaner:
+        """Data cleaner configured with the liquidity threshold."""
+        return DataCleaner(liquidity_threshold=self.liquidity_threshold)
+    
+    @cached_property
+    def signal_generator(self) -> SignalGenerator:
+        """Momentum signal generator."""
+        return SignalGenerator()
+    
+    @cached_property
+    def analyzer(self) -> PerformanceAnalyzer:
+        """Performance analyzer."""
+        return PerformanceAnalyzer()
         
     def fetch_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -85,21 +171,74 @@ class StatArbitrageStrategy:
         """
         logger.info("Fetching cryptocurrency data...")
         
-        returns_dict, volumes_dict = self.fetcher.fetch_cryptocurrency_data(
-            symbols=self.symbols,
+        # Fetch the universe (duplicates merged, order kept) and the benchmark in one concurrent batch
+        universe = list(dict.fromkeys(self.symbols))
+        fetch_symbols = list(universe)
+        if self.benchmark_symbol not in fetch_symbols:
+            fetch_symbols.append(self.benchmark_symbol)
+            
+        # Preallocate float32 (dates x symbols) arrays on one canonical daily index,
+        # with columns named by plain symbol (e.g. 'BTCUSDT' rather than 'BTCUSDT_Close')
+        all_dates = pd.date_range(self.start_date, self.end_date, freq="D", tz="UTC", name="open_time")
+        index_ns = all_dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        columns = {symbol: j for j, symbol in enumerate(universe)}
+        returns_arr = np.full((len(all_dates), len(columns)), np.nan, dtype=np.float32)
+        volumes_arr = np.full((len(all_dates), len(columns)), np.nan, dtype=np.float32)
+        fetched = np.zeros(len(columns), dtype=bool)
+        self.benchmark_returns = None
+        
+        # Align each symbol into its column as soon as its download completes,
+        # overlapping that work with the fetches still in flight
+        for symbol, returns, volumes in self.fetcher.iter_cryptocurrency_data(
+            symbols=fetch_symbols,
             start_date=self.start_date,
             end_date=self.end_date,
             interval="1d"
-        )
+        ):
+            if symbol == self.benchmark_symbol:
+                self.benchmark_returns = returns
+            if symbol not in columns:
+                continue
+                
+            j = columns[symbol]
+            self._place_series(returns_arr[:, j], index_ns, returns)
+            self._place_series(volumes_arr[:, j], index_ns, volumes)
+            fetched[j] = True
+            
+        # Keep the symbols that returned data, in universe order
+        if not fetched.all():
+            returns_arr = returns_arr[:, fetched]
+            volumes_arr = volumes_arr[:, fetched]
+        symbols = [symbol for symbol, ok in zip(columns, fetched) if ok]
         
-        # Convert dictionaries to DataFrames
-        self.returns = pd.DataFrame(returns_dict)
-        self.volumes = pd.DataFrame(volumes_dict)
+        self.returns = pd.DataFrame(returns_arr, index=all_dates, columns=symbols, copy=False)
+        self.volumes = pd.DataFrame(volumes_arr, index=all_dates, columns=symbols, copy=False)
         
-        logger.info(f"Fetched data: {self.returns.shape[0]} days, {self.returns.shape[1]} assets")
+        logger.info("Fetched data: %d days, %d assets", self.returns.shape[0], self.returns.shape[1])
         
         return self.returns, self.volumes
     
+    def _place_series(self, column: np.ndarray, index_ns: np.ndarray, series: pd.Series) -> None:
+        """
+        Write a symbol's series into its column of a preallocated (dates x symbols) array.
+        
+        Avoids the repeated index union/realignment of ``pd.DataFrame(dict)`` (and
+        of ``pd.concat``'s outer join): dates are matched with a binary search on
+        int64 nanoseconds, without building pandas Index objects. Storage is
+        float32: daily returns are O(1e-2), so ~7 significant digits is ample and
+        every downstream pass moves half the bytes.
+        
+        Args:
+            column: Column view of the preallocated array (NaN where there is no data)
+            index_ns: Canonical date index as int64 nanoseconds
+            series: Series indexed by date
+        """
+        series_ns = series.index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        positions = np.searchsorted(index_ns, series_ns)
+        matched = positions < len(index_ns)
+        matched[matched] = index_ns[positions[matched]] == series_ns[matched]
+        column[positions[matched]] = series.to_numpy(dtype=column.dtype)[matched]
+    
     def prepare_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Clean and prepare data for analysis.
@@ -119,8 +258,9 @@ class StatArbitrageStrategy:
             min_assets=8
         )
         
-        # Verify data quality
-        self.cleaner.verify_data_quality(self.returns, self.volumes)
+        # Verify data quality (full describe() scan, so only in debug mode)
+        if self.debug:
+            self.cleaner.verify_data_quality(self.returns, self.volumes)
         
         return self.returns, self.volumes
     
@@ -137,17 +277,21 @@ class StatArbitrageStrategy:
             
         logger.info("Generating momentum signals...")
         
+        # One call for all windows, so they share one float32 copy and cumulative sum
+        # (the generator runs the windows in parallel threads itself)
         self.momentum_signals = self.signal_generator.generate_momentum_signals(
             returns=self.returns,
             windows=self.momentum_windows
         )
         
-        # Print signal statistics
-        for window, signals in self.momentum_signals.items():
-            weights = signals['portfolio_weights']
-            logger.info(f"\nSignal statistics for {window}:")
-            logger.info(f"  Mean concentration: {weights.abs().max().mean():.4f}")
-            logger.info(f"  Avg turnover: {weights.diff().abs().sum(axis=1).mean():.4f}")
+        # Print signal statistics (skip the array passes entirely when INFO is off)
+        if logger.isEnabledFor(logging.INFO):
+            for window, signals in self.momentum_signals.items():
+                # Mean per-asset peak weight and daily turnover in one pass
+                concentration, turnover = weight_stats(signals['portfolio_weights'].to_numpy(copy=False))
+                logger.info("\nSignal statistics for %s:", window)
+                logger.info("  Mean concentration: %.4f", concentration)
+                logger.info("  Avg turnover: %.4f", turnover)
         
         return self.momentum_signals
     
@@ -164,42 +308,244 @@ class StatArbitrageStrategy:
             
         logger.info("Running backtest...")
         
-        # Fetch BTC returns as benchmark
-        btc_returns_dict, _ = self.fetcher.fetch_cryptocurrency_data(
-            symbols=["BTCUSDT"],
-            start_date=self.start_date,
-            end_date=self.end_date
+        # Reuse the cleaned benchmark column when the benchmark is part of the universe
+        if self.benchmark_symbol in self.returns.columns:
+            self.benchmark_returns = self.returns[self.benchmark_symbol]
+            benchmark = self.benchmark_returns
+        else:
+            # Otherwise it normally arrived with the universe in fetch_data()
+            if self.benchmark_returns is None:
+                benchmark_dict, _ = self.fetcher.fetch_cryptocurrency_data(
+                    symbols=[self.benchmark_symbol],
+                    start_date=self.start_date,
+                    end_date=self.end_date
+                )
+                self.benchmark_returns = benchmark_dict[f"{self.benchmark_symbol}_Close"]
+                
+            # Match the cleaned (timezone-naive) returns index
+            if self.benchmark_returns.index.tz is not None:
+                self.benchmark_returns = self.benchmark_returns.tz_localize(None)
+            benchmark = self.benchmark_returns.reindex(self.returns.index)
+            
+        # Benchmark on the returns index, in float32 like the returns themselves
+        benchmark = benchmark.astype(np.float32)
+        
+        # Calculate strategy returns and metrics for each window in parallel
+        # (create the analyzer up front rather than racing to do so in the workers)
+        analyzer = self.analyzer
+        with ThreadPoolExecutor(max_workers=max(1, len(self.momentum_signals))) as executor:
+            performance_results = dict(executor.map(
+                lambda item: self._backtest_window(analyzer, *item, benchmark),
+                self.momentum_signals.items()
+            ))
+            
+        # Print results
+        for window in self.momentum_signals:
+            analyzer.print_performance_summary(
+                performance_results[f"mom_{window}"]['metrics'],
+                f"Momentum {window}"
+            )
+        
+        return performance_results
+    
+    def _backtest_window(
+        self,
+        analyzer: PerformanceAnalyzer,
+        window: str,
+        signals: Dict,
+        benchmark: pd.Series
+    ) -> Tuple[str, Dict]:
+        """
+        Backtest a single momentum window.
+        
+        Args:
+            analyzer: Performance analyzer shared by all windows
+            window: Window label (e.g. '120d')
+            signals: Signal dictionary for the window
+            benchmark: Benchmark returns on the returns index
+            
+        Returns:
+            Tuple of (strategy_name, {'returns': ..., 'metrics': ...})
+        """
+        weights = signals['portfolio_weights']
+        
+        # Calculate strategy returns
+        strategy_returns = analyzer.calculate_returns(
+            portfolio_weights=weights,
+            daily_returns=self.returns,
+            transaction_cost_pct=self.transaction_cost_pct
         )
-        self.benchmark_returns = btc_returns_dict["BTCUSDT_Close"]
         
-        # Calculate strategy returns and metrics for each window
-        performance_results = {}
+        # Pass the benchmark as an array on exactly the strategy's days, so the
+        # analyzer can skip its own alignment
+        benchmark_returns = benchmark.reindex(strategy_returns.index).to_numpy()
         
-        for window, signals in self.momentum_signals.items():
-            weights = signals['portfolio_weights']
+        # Calculate metrics
+        metrics = analyzer.calculate_performance_metrics(
+            strategy_returns=strategy_returns,
+            benchmark_returns=benchmark_returns
+        )
+        
+        return f"mom_{window}", {
+            'returns': strategy_returns,
+            'metrics': metrics
+        }
+    
+    def _stage_files(self, stage: str) -> list:
+        """
+        Names of the files that make up a persisted pipeline stage.
+        
+        Args:
+            stage: One of PIPELINE_STAGES
             
-            # Calculate strategy returns
-            strategy_returns = self.analyzer.calculate_returns(
-                portfolio_weights=weights,
-                daily_returns=self.returns,
-                transaction_cost_pct=self.transaction_cost_pct
-            )
+        Returns:
+            List of file names (without directory or extension)
+        """
+        if stage == "signals":
+            return [
+                f"signals_{window}d_{field}"
+                for window in self.momentum_windows
+                for field in self.SIGNAL_FIELDS
+            ]
+        return [f"{stage}_returns", f"{stage}_volumes"]
+    
+    def _stage_path(self, name: str) -> str:
+        """Path of a stage file inside stage_dir."""
+        return os.path.join(self.stage_dir, f"{name}.arrow")
+    
+    def _stage_settings(self) -> Dict:
+        """Settings the stage outputs depend on; resuming requires them to match."""
+        return {
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "symbols": list(self.symbols),
+            "benchmark_symbol": self.benchmark_symbol,
+            "liquidity_threshold": self.liquidity_threshold,
+            "momentum_windows": list(self.momentum_windows)
+        }
+    
+    def _manifest_stages(self) -> Optional[list]:
+        """
+        Stages recorded as complete in stage_dir's manifest.
+        
+        Returns:
+            List of stage names, or None if there is no manifest or it was
+            written with different settings
+        """
+        manifest_path = os.path.join(self.stage_dir, self.STAGE_MANIFEST)
+        if not os.path.exists(manifest_path):
+            return None
             
-            # Calculate metrics
-            metrics = self.analyzer.calculate_performance_metrics(
-                strategy_returns=strategy_returns,
-                benchmark_returns=self.benchmark_returns
-            )
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+            
+        if manifest.get("settings") != self._stage_settings():
+            return None
+        return manifest.get("stages", [])
+    
+    def _write_manifest(self, stages: list) -> None:
+        """
+        Record the completed stages and the current settings in stage_dir.
+        
+        Args:
+            stages: Names of the stages whose outputs are complete
+        """
+        manifest_path = os.path.join(self.stage_dir, self.STAGE_MANIFEST)
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"settings": self._stage_settings(), "stages": stages}, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+    
+    def save_stage(self, stage: str) -> None:
+        """
+        Persist the outputs of a pipeline stage to stage_dir as Arrow IPC files.
+        
+        Args:
+            stage: One of PIPELINE_STAGES
+        """
+        if self.stage_dir is None:
+            return
             
-            performance_results[f"mom_{window}"] = {
-                'returns': strategy_returns,
-                'metrics': metrics
+        # Later stages were built from the outputs about to be replaced, so drop them
+        # (and mark this stage incomplete until its files are written)
+        position = self.PIPELINE_STAGES.index(stage)
+        stages = [
+            done for done in (self._manifest_stages() or [])
+            if self.PIPELINE_STAGES.index(done) < position
+        ]
+        
+        if stage == "signals":
+            frames = {
+                f"signals_{window}_{field}": frame
+                for window, signals in self.momentum_signals.items()
+                for field, frame in signals.items()
             }
+        else:
+            frames = {f"{stage}_returns": self.returns, f"{stage}_volumes": self.volumes}
+            if stage == "fetch" and self.benchmark_returns is not None:
+                frames["benchmark"] = self.benchmark_returns.to_frame()
+                
+        os.makedirs(self.stage_dir, exist_ok=True)
+        self._write_manifest(stages)
+        
+        for name, frame in frames.items():
+            _write_arrow(frame, self._stage_path(name))
+            
+        # Never resume with a benchmark left over from an earlier fetch
+        if stage == "fetch" and "benchmark" not in frames and os.path.exists(self._stage_path("benchmark")):
+            os.remove(self._stage_path("benchmark"))
             
-            # Print results
-            self.analyzer.print_performance_summary(metrics, f"Momentum {window}")
+        self._write_manifest(stages + [stage])
         
-        return performance_results
+        logger.info("Saved %s stage to %s", stage, self.stage_dir)
+    
+    def load_stages(self) -> int:
+        """
+        Load the outputs of the furthest pipeline stage persisted in stage_dir.
+        
+        Returns:
+            Number of completed stages loaded (0 if there is nothing to resume from)
+        """
+        if self.stage_dir is None:
+            return 0
+            
+        stages = self._manifest_stages()
+        if stages is None:
+            if os.path.exists(os.path.join(self.stage_dir, self.STAGE_MANIFEST)):
+                logger.info("Ignoring stage outputs in %s: they were saved with different settings", self.stage_dir)
+            return 0
+            
+        completed = 0
+        for stage in self.PIPELINE_STAGES:
+            if stage not in stages:
+                break
+            if not all(os.path.exists(self._stage_path(name)) for name in self._stage_files(stage)):
+                break
+            completed += 1
+            
+        if completed == 0:
+            return 0
+            
+        # Returns and volumes come from the later of the fetch and prepare stages
+        data_stage = "prepare" if completed >= 2 else "fetch"
+        self.returns = _read_arrow(self._stage_path(f"{data_stage}_returns"))
+        self.volumes = _read_arrow(self._stage_path(f"{data_stage}_volumes"))
+        
+        if os.path.exists(self._stage_path("benchmark")):
+            self.benchmark_returns = _read_arrow(self._stage_path("benchmark")).iloc[:, 0]
+            
+        if completed >= 3:
+            self.momentum_signals = {
+                f"{window}d": {
+                    field: _read_arrow(self._stage_path(f"signals_{window}d_{field}"))
+                    for field in self.SIGNAL_FIELDS
+                }
+                for window in self.momentum_windows
+            }
+            
+        logger.info("Resuming after %s stage from %s", self.PIPELINE_STAGES[completed - 1], self.stage_dir)
+        
+        return completed
     
     def run_full_pipeline(self) -> Dict:
         """
@@ -212,10 +558,13 @@ class StatArbitrageStrategy:
         logger.info("STATISTICAL ARBITRAGE MOMENTUM STRATEGY")
         logger.info("="*60)
         
-        # Execute pipeline
-        self.fetch_data()
-        self.prepare_data()
-        self.generate_signals()
+        # Execute pipeline, resuming after the last stage persisted in stage_dir
+        completed = self.load_stages()
+        stage_runs = (self.fetch_data, self.prepare_data, self.generate_signals)
+        for stage, run_stage in zip(self.PIPELINE_STAGES[completed:], stage_runs[completed:]):
+            run_stage()
+            self.save_stage(stage)
+            
         results = self.backtest()
         
         logger.info("Strategy execution complete!")
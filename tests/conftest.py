@@ -0,0 +1,11 @@
+"""
+Test configuration: put the repository root and src/ on sys.path, matching how
+main.py and strategy.py import the modules.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
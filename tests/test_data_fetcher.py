@@ -0,0 +1,118 @@
+"""
+Tests for DataFetcher's Parquet kline cache, against a fake Binance session.
+"""
+
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from data_fetcher import DataFetcher
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response carrying a klines payload."""
+    
+    status_code = 200
+    headers = {}
+    
+    def __init__(self, klines: list):
+        self._klines = klines
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self) -> list:
+        return self._klines
+
+
+class FakeSession:
+    """Serves klines for the given open times and counts the requests made."""
+    
+    def __init__(self, open_times: pd.DatetimeIndex):
+        self.open_ts = open_times.as_unit('ms').asi8
+        self.calls = 0
+    
+    def get(self, url, params=None, timeout=None) -> FakeResponse:
+        self.calls += 1
+        lo = np.searchsorted(self.open_ts, params['startTime'], side='left')
+        hi = np.searchsorted(self.open_ts, params['endTime'], side='right')
+        hi = min(hi, lo + params['limit'])
+        
+        klines = [
+            [int(ts), "0", "0", "0", str(100.0 + i), str(1000.0 + i)]
+            for i, ts in zip(range(lo, hi), self.open_ts[lo:hi])
+        ]
+        return FakeResponse(klines)
+    
+    def close(self):
+        pass
+
+
+def _fetcher(session: FakeSession, cache_dir=None) -> DataFetcher:
+    fetcher = DataFetcher(max_workers=2, cache_dir=cache_dir)
+    fetcher.session = session
+    return fetcher
+
+
+def _daily_market(end: str) -> FakeSession:
+    return FakeSession(pd.date_range("2020-01-01", end, freq="D"))
+
+
+def test_second_cached_fetch_makes_no_http_calls(tmp_path):
+    session = _daily_market("2021-12-31")
+    fetcher = _fetcher(session, cache_dir=str(tmp_path))
+    
+    first = fetcher.fetch_cryptocurrency_data(["BTCUSDT", "ETHUSDT"], "2020-01-01", "2021-06-30")
+    calls = session.calls
+    second = fetcher.fetch_cryptocurrency_data(["BTCUSDT", "ETHUSDT"], "2020-01-01", "2021-06-30")
+    
+    assert calls > 0
+    assert session.calls == calls
+    for first_data, second_data in zip(first, second):
+        assert list(first_data) == list(second_data)
+        for key in first_data:
+            pdt.assert_series_equal(first_data[key], second_data[key])
+
+
+def test_extended_cached_fetch_matches_uncached_fetch(tmp_path):
+    session = _daily_market("2021-12-31")
+    cached = _fetcher(session, cache_dir=str(tmp_path))
+    
+    cached.fetch_cryptocurrency_data(["BTCUSDT"], "2020-01-01", "2021-06-30")
+    returns, volumes = cached.fetch_cryptocurrency_data(["BTCUSDT"], "2020-01-01", "2021-07-01")
+    expected_returns, expected_volumes = _fetcher(session).fetch_cryptocurrency_data(
+        ["BTCUSDT"], "2020-01-01", "2021-07-01"
+    )
+    
+    assert returns["BTCUSDT_Close"].index[-1] == pd.Timestamp("2021-07-01", tz="UTC")
+    pdt.assert_series_equal(returns["BTCUSDT_Close"], expected_returns["BTCUSDT_Close"])
+    pdt.assert_series_equal(volumes["BTCUSDT_Vol"], expected_volumes["BTCUSDT_Vol"])
+
+
+def test_monthly_cache_resume_does_not_skip_months(tmp_path):
+    session = FakeSession(pd.date_range("2020-01-01", "2021-12-01", freq="MS"))
+    fetcher = _fetcher(session, cache_dir=str(tmp_path))
+    
+    fetcher.fetch_cryptocurrency_data(["BTCUSDT"], "2020-01-01", "2021-02-01", interval="1M")
+    _, volumes = fetcher.fetch_cryptocurrency_data(["BTCUSDT"], "2020-01-01", "2021-06-01", interval="1M")
+    
+    expected = pd.date_range("2020-01-01", "2021-06-01", freq="MS", tz="UTC")
+    np.testing.assert_array_equal(volumes["BTCUSDT_Vol"].index, expected)
+
+
+def test_open_candle_is_returned_but_not_cached(tmp_path):
+    today = datetime.now(timezone.utc).date().isoformat()
+    session = _daily_market(today)
+    fetcher = _fetcher(session, cache_dir=str(tmp_path))
+    
+    _, volumes = fetcher.fetch_cryptocurrency_data(["BTCUSDT"], "2020-01-01")
+    
+    cache_file, = os.listdir(tmp_path)
+    cached = pd.read_parquet(os.path.join(tmp_path, cache_file))
+    today_ms = int(pd.Timestamp(today).timestamp() * 1000)
+    assert volumes["BTCUSDT_Vol"].index[-1] == pd.Timestamp(today, tz="UTC")
+    assert cached['open_time'].iloc[-1] < today_ms
+    assert len(cached) == len(volumes["BTCUSDT_Vol"]) - 1
@@ -0,0 +1,45 @@
+"""
+Tests for PerformanceAnalyzer's batched metrics path.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import performance_analyzer
+from performance_analyzer import PerformanceAnalyzer
+
+
+def _strategy_returns() -> dict:
+    """Three strategies on one shared daily index, one with NaN gaps."""
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2020-01-01", periods=400, freq="D")
+    strategies = {
+        name: pd.Series(rng.normal(mean, 0.01, len(index)), index=index)
+        for name, mean in [("mom_60d", 0.001), ("mom_120d", 0.0), ("mom_252d", -0.0005)]
+    }
+    strategies["mom_120d"].iloc[[5, 50, 51]] = np.nan
+    return strategies
+
+
+@pytest.mark.skipif(not performance_analyzer.NUMBA_AVAILABLE, reason="numba fast path not available")
+@pytest.mark.parametrize("with_benchmark", [False, True])
+def test_compare_strategies_fast_path_matches_per_strategy_metrics(with_benchmark):
+    analyzer = PerformanceAnalyzer()
+    strategies = _strategy_returns()
+    benchmark = None
+    if with_benchmark:
+        benchmark = pd.Series(
+            np.random.default_rng(2).normal(0.0005, 0.02, 400),
+            index=strategies["mom_60d"].index
+        )
+    
+    comparison = analyzer.compare_strategies(strategies, benchmark)
+    
+    for name, returns in strategies.items():
+        expected = analyzer.calculate_performance_metrics(returns, benchmark)
+        for metric, value in expected.items():
+            if metric == 'cumulative_returns':
+                pd.testing.assert_series_equal(comparison.loc[name, metric], value)
+            else:
+                assert comparison.loc[name, metric] == pytest.approx(value, rel=1e-10, abs=1e-12), metric
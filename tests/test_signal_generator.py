@@ -0,0 +1,54 @@
+"""
+Tests for the NumPy signal helpers against their pandas equivalents.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signal_generator import _rank_rows, _rolling_mean
+
+
+def _returns_with_ties_and_nans(dtype=np.float64) -> np.ndarray:
+    """Returns on a coarse grid (many exact ties) with scattered and leading NaNs."""
+    rng = np.random.default_rng(0)
+    R = rng.integers(-3, 4, size=(200, 9)).astype(dtype) / 100
+    R[rng.random(R.shape) < 0.1] = np.nan
+    R[:30, 2] = np.nan
+    R[:, 5] = np.nan
+    return R
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_rank_rows_matches_pandas_average_ranks(dtype):
+    X = _returns_with_ties_and_nans(dtype)
+    
+    expected = pd.DataFrame(X).rank(axis=1).to_numpy()
+    
+    np.testing.assert_array_equal(_rank_rows(X), expected)
+
+
+def test_rank_rows_all_nan_row_stays_nan():
+    X = np.array([[np.nan, np.nan, np.nan], [2.0, 1.0, 2.0]])
+    
+    ranks = _rank_rows(X)
+    
+    assert np.isnan(ranks[0]).all()
+    np.testing.assert_array_equal(ranks[1], [2.5, 1.0, 2.5])
+
+
+@pytest.mark.parametrize("window", [1, 3, 20, 250])
+def test_rolling_mean_matches_pandas(window):
+    R = _returns_with_ties_and_nans()
+    
+    expected = pd.DataFrame(R).rolling(window).mean().to_numpy()
+    
+    np.testing.assert_allclose(_rolling_mean(R, window), expected, rtol=1e-12, atol=1e-15)
+    # NaN placement must match exactly, not just within tolerance
+    np.testing.assert_array_equal(np.isnan(_rolling_mean(R, window)), np.isnan(expected))
+
+
+def test_rolling_mean_window_one_keeps_exact_ties():
+    R = _returns_with_ties_and_nans()
+    
+    np.testing.assert_array_equal(_rank_rows(_rolling_mean(R, 1)), pd.DataFrame(R).rank(axis=1).to_numpy())